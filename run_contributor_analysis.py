@@ -3,6 +3,8 @@
 Run contributor analysis (headless) — reproduces the notebook plots and saves PNGs.
 """
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -10,45 +12,101 @@ import seaborn as sns
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 sns.set_theme(style='whitegrid')
 
+# Arrow types for the master CSV columns the analysis touches (keyed by lower-cased name): repeated
+# text dictionary-encoded (category in pandas), counts as float64 because pandas writes a count
+# column with any gap as "2.0" (they become nullable Int32 per chunk, see COUNT_COLUMNS); every
+# other column is read as plain text
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+COUNT_COLUMNS = ('public_repos', 'followers', 'following')
+MASTER_TYPES = {
+    'login': _CATEGORY, 'company': _CATEGORY, 'full_name': _CATEGORY, 'repo_name': _CATEGORY,
+    'repo': _CATEGORY, 'owner': _CATEGORY, 'repo_dir': _CATEGORY, 'topics': _CATEGORY,
+    **{c: pa.float64() for c in COUNT_COLUMNS},
+}
+# Cells pd.read_csv reads as missing by default (same list as the pipeline's utils.CSV_NULL_VALUES);
+# pyarrow's defaults lack "None" and "<NA>"
+CSV_NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                   "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+# Legal-entity suffix at the end of a company name ("Acme, Inc.", "Foo LLC", "Bar GmbH")
+_ORG_SUFFIX_RX = re.compile(r'(?:,\s*|\s+)(?:inc|llc|ltd|gmbh)\.?\s*$', re.IGNORECASE)
+# Rows read from the master CSV at a time
+CHUNK_ROWS = 500_000
+# The cleaned table is written as Parquet; set CLEANED_CSV=1 to also get the old CSV copy
+WRITE_CLEANED_CSV = os.environ.get('CLEANED_CSV', '') not in ('', '0')
 
+
+@lru_cache(maxsize=1)
 def find_data_clean_dir():
     env = os.environ.get('DATA_CLEAN_DIR')
     if env:
         p = Path(env)
-        if p.exists():
+        if p.is_dir():
             return p.resolve()
-    cwd = Path.cwd()
-    for d in [cwd] + list(cwd.parents):
+    # walking up from the resolved cwd also covers data/clean, ../data/clean and ../../data/clean
+    cwd = Path.cwd().resolve()
+    for d in (cwd, *cwd.parents):
         candidate = d / 'data' / 'clean'
-        if candidate.exists():
+        if candidate.is_dir():
             return candidate.resolve()
-    for rel in [Path('data/clean'), Path('../data/clean'), Path('../../data/clean')]:
-        if rel.exists():
-            return rel.resolve()
     return None
 
 
-def normalize_org(s):
-    s = str(s).strip()
-    if not s:
-        return ''
-    s = s.replace('\n',' ').strip()
-    for suffix in [', inc', ' inc.', ' inc', ' llc', ' llc.', ' ltd', ' ltd.', ' gmbh']:
-        s = s.replace(suffix, '')
-    return s
+def iter_master_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Stream the master CSV through pyarrow's reader as DataFrames of roughly chunk_rows rows."""
+    column_types = {c: MASTER_TYPES.get(c.strip().lower(), pa.string()) for c in columns}
+    reader = pa_csv.open_csv(
+        path,
+        # bios and other free text can hold quoted newlines
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, null_values=CSV_NULL_VALUES,
+                                              strings_can_be_null=True),
+    )
+    counts = {c: 'Int32' for c in columns if c.strip().lower() in COUNT_COLUMNS}
+
+    def to_frame(batches):
+        return pa.Table.from_batches(batches).to_pandas().astype(counts)
+
+    batches, n = [], 0
+    for batch in reader:
+        batches.append(batch)
+        n += batch.num_rows
+        if n >= chunk_rows:
+            yield to_frame(batches)
+            batches, n = [], 0
+    if batches:
+        yield to_frame(batches)
+
+
+def parquet_schema(df):
+    """Arrow schema for the cleaned chunks: taken from the first one, with category codes widened
+    to int32 (later chunks may have more categories) and all-null columns, categories included,
+    typed as string."""
+    fields = []
+    for field in pa.Schema.from_pandas(df, preserve_index=False):
+        if pa.types.is_dictionary(field.type):
+            value_type = pa.string() if pa.types.is_null(field.type.value_type) else field.type.value_type
+            field = field.with_type(pa.dictionary(pa.int32(), value_type))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields)
 
 
-def to_topics(x):
-    if pd.isna(x):
-        return []
-    s = str(x)
-    for ch in '[]"\'':
-        s = s.replace(ch, '')
-    parts = [p.strip().lower() for p in s.split(',') if p.strip()]
-    return parts
+def normalize_org_series(s):
+    """Company names with newlines flattened and a trailing legal-entity suffix dropped, for a whole column."""
+    return s.str.replace('\n', ' ', regex=False).str.strip().str.replace(_ORG_SUFFIX_RX, '', regex=True).str.strip()
+
+
+def topics_series(s):
+    """Topic cells ("['a', 'B ']") as lower-cased, comma-joined strings with blank entries dropped ("a,b"), for a whole column."""
+    s = s.astype('string').fillna('').str.replace(r'[\[\]"\']', '', regex=True).str.lower()
+    return s.str.replace(r'\s*,\s*', ',', regex=True).str.replace(r',{2,}', ',', regex=True).str.strip().str.strip(',')
 
 
 def main():
@@ -69,57 +127,114 @@ def main():
     else:
         raise SystemExit(f'No master CSV found in {by_topics}')
     print('Using master CSV:', master_csv)
-    df = pd.read_csv(master_csv)
-    print('Loaded rows,cols:', df.shape)
+    header = pd.read_csv(master_csv, nrows=0).columns
 
     # normalize
-    df.columns = [c.strip() for c in df.columns]
-    lc = {c.lower(): c for c in df.columns}
-    login_col = lc.get('login', lc.get('username', df.columns[0]))
+    columns = [c.strip() for c in header]
+    lc = {c.lower(): c for c in columns}
+    login_col = lc.get('login', lc.get('username', columns[0]))
     company_col = lc.get('company')
     blog_col = lc.get('blog')
     topics_col = lc.get('matched_topics', lc.get('topics'))
     repo_col = lc.get('full_name', lc.get('repo_name', lc.get('repo')))
     created_col = lc.get('created_at')
+    repo_col_use = repo_col if repo_col in columns else columns[0]
+    has_followers = 'followers' in columns and 'public_repos' in columns
 
-    if company_col:
-        df['company_clean'] = df[company_col].fillna('').astype(str).str.strip()
-    else:
-        df['company_clean'] = ''
-    if blog_col:
-        df['blog_clean'] = df[blog_col].fillna('').astype(str).str.strip()
-    else:
-        df['blog_clean'] = ''
+    fig_dir = by_topics / 'figures'
+    fig_dir.mkdir(parents=True, exist_ok=True)
+    clean_out = by_topics / 'all_contributors_master_dedup_cleaned.parquet'
+    clean_csv = clean_out.with_suffix('.csv')
+    # written under a temporary name and renamed once complete, like the pipeline's master Parquet
+    clean_tmp = clean_out.with_name(clean_out.name + '.tmp')
+    writer = None
 
-    if topics_col:
-        df['topics_list'] = df[topics_col].apply(to_topics)
-    else:
-        df['topics_list'] = [[] for _ in range(len(df))]
+    # The master CSV is read in chunks. Every unique-contributor count below only needs the distinct
+    # (key, login_key) pairs, so each chunk is reduced to those before the next one is read, and the
+    # cleaned rows are appended to the Parquet output (and to the CSV copy when CLEANED_CSV=1).
+    now_utc = pd.Timestamp.now(tz='UTC')
+    topic_pairs, repo_pairs, company_pairs, topic_company_pairs, year_pairs = [], [], [], [], []
+    # (public_repos, followers) of every row for the hexbin; two ints per row, no need to sample
+    followers_repos = []
+    n_rows = 0
+    org_names = {}
+    for chunk_no, df in enumerate(iter_master_chunks(master_csv, header)):
+        # dictionary columns arrive with categories in order of appearance; sort them so groupby output stays alphabetical
+        for c in df.select_dtypes('category').columns:
+            df[c] = df[c].cat.reorder_categories(df[c].cat.categories.sort_values())
+        df.columns = columns
+        n_rows += len(df)
 
-    # ensure a consistent contributor key
-    df['login_key'] = df[login_col].astype(str)
+        if company_col:
+            df['company_clean'] = df[company_col].astype('string').fillna('').str.strip()
+        else:
+            df['company_clean'] = ''
+        if blog_col:
+            df['blog_clean'] = df[blog_col].fillna('').astype(str).str.strip()
+        else:
+            df['blog_clean'] = ''
 
-    df_topics = df.copy()
-    df_topics = df_topics.explode('topics_list')
-    df_topics['topic'] = df_topics['topics_list'].fillna('').astype(str)
+        if topics_col:
+            topics = topics_series(df[topics_col])
+        else:
+            topics = pd.Series('', index=df.index, dtype='string')
+        df['topics_list'] = ("['" + topics.str.replace(',', "', '", regex=False) + "']").where(topics != '', '[]')
 
-    if created_col and created_col in df.columns:
-        # parse timestamps as UTC to avoid tz-aware vs tz-naive arithmetic errors
-        df['created_at_dt'] = pd.to_datetime(df[created_col], errors='coerce', utc=True)
-        now_utc = pd.Timestamp.now(tz='UTC')
-        df['account_age_years'] = (now_utc - df['created_at_dt']).dt.days / 365.25
-    else:
-        df['created_at_dt'] = pd.NaT
-        df['account_age_years'] = np.nan
+        # ensure a consistent contributor key
+        df['login_key'] = df[login_col].astype(str)
 
-    df['login_key'] = df[login_col].astype(str)
+        if created_col and created_col in df.columns:
+            # parse timestamps as UTC to avoid tz-aware vs tz-naive arithmetic errors
+            df['created_at_dt'] = pd.to_datetime(df[created_col], errors='coerce', utc=True)
+            df['account_age_years'] = (now_utc - df['created_at_dt']).dt.days / 365.25
+        else:
+            df['created_at_dt'] = pd.NaT
+            df['account_age_years'] = np.nan
+        # company names repeat heavily: normalize each distinct string once per run and map the rest
+        distinct = pd.Series(df['company_clean'].unique())
+        distinct = distinct[~distinct.isin(org_names.keys())]
+        org_names.update(zip(distinct, normalize_org_series(distinct)))
+        df['company_norm'] = df['company_clean'].map(org_names)
+        if created_col and created_col in df.columns:
+            df['created_year'] = df['created_at_dt'].dt.year.astype('Int32')
 
-    fig_dir = by_topics / 'figures'
-    fig_dir.mkdir(parents=True, exist_ok=True)
+        # only the columns the per-topic breakdowns use, one row per (contributor row, topic)
+        # (rows without topics keep a single '' topic)
+        topic = topics.str.split(',').explode()
+        df_topics = df.loc[topic.index, ['login_key', 'company_clean', 'company_norm']]
+        df_topics['topic'] = topic.astype(str).astype('category').array
+        has_topic = df_topics['topic'] != ''
+
+        topic_pairs.append(df_topics.loc[has_topic, ['topic', 'login_key']].drop_duplicates())
+        repo_pairs.append(df[[repo_col_use, 'login_key']].drop_duplicates())
+        company_pairs.append(df.loc[df['company_norm'] != '', ['company_norm', 'login_key']].drop_duplicates())
+        topic_company_pairs.append(df_topics.loc[df_topics['company_clean'] != '', ['topic', 'company_norm', 'login_key']].drop_duplicates())
+        if 'created_year' in df.columns:
+            year_pairs.append(df[['created_year', 'login_key']].dropna().drop_duplicates())
+        if has_followers:
+            followers_repos.append(df[['public_repos', 'followers']].dropna())
+
+        # save cleaned table
+        if writer is None:
+            writer = pq.ParquetWriter(clean_tmp, parquet_schema(df), compression='zstd')
+        writer.write_table(pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False))
+        if WRITE_CLEANED_CSV:
+            df.to_csv(clean_csv, index=False, mode='w' if chunk_no == 0 else 'a', header=chunk_no == 0)
+    if writer is not None:
+        writer.close()
+        os.replace(clean_tmp, clean_out)
+    print('Loaded rows,cols:', (n_rows, len(columns)))
+
+    def unique_contributors(pairs, keys):
+        """Unique contributors per key, from the per-chunk (key, login_key) pairs."""
+        # pairs are distinct once deduplicated across chunks, so a plain group size is the unique count
+        grouped = pd.concat(pairs, ignore_index=True).drop_duplicates().groupby(keys, observed=True).size()
+        grouped = grouped.rename('unique_contributors').reset_index()
+        # plain labels: seaborn would draw a bar slot for every category, in category order
+        return grouped.astype({c: str for c in grouped.select_dtypes('category').columns})
 
     # 4) contributors per topic
-    topic_counts = df_topics[df_topics['topic'] != ''].groupby('topic')['login_key'].nunique().reset_index()
-    topic_counts = topic_counts.rename(columns={'login_key':'unique_contributors'})
+    topic_counts = unique_contributors(topic_pairs, 'topic')
     topic_counts = topic_counts.sort_values('unique_contributors', ascending=False)
     top_n = min(30, len(topic_counts))
     plt.figure(figsize=(10, max(6, top_n*0.35)))
@@ -134,8 +249,7 @@ def main():
     print('Saved:', out_path)
 
     # 5) top repos
-    repo_col_use = repo_col if repo_col in df.columns else df.columns[0]
-    repo_counts = df.groupby(repo_col_use)['login_key'].nunique().reset_index().rename(columns={'login_key':'unique_contributors'})
+    repo_counts = unique_contributors(repo_pairs, repo_col_use)
     repo_counts = repo_counts.sort_values('unique_contributors', ascending=False)
     top100 = repo_counts.head(100).copy()
     top30 = top100.head(30)
@@ -162,8 +276,7 @@ def main():
     print('Saved:', out_path)
 
     # 6) top 50 orgs
-    df['company_norm'] = df['company_clean'].apply(normalize_org)
-    company_counts = df[df['company_norm'] != ''].groupby('company_norm')['login_key'].nunique().reset_index().rename(columns={'login_key':'unique_contributors'})
+    company_counts = unique_contributors(company_pairs, 'company_norm')
     company_counts = company_counts.sort_values('unique_contributors', ascending=False)
     top50_companies = company_counts.head(50)
     plt.figure(figsize=(10, max(8, len(top50_companies)*0.25)))
@@ -178,17 +291,14 @@ def main():
     print('Saved:', out_path)
 
     # 7) top company per topic
-    topic_company = df_topics[df_topics['company_clean'] != ''].copy()
-    topic_company['company_norm'] = topic_company['company_clean'].apply(normalize_org)
-    grp = topic_company.groupby(['topic','company_norm'])['login_key'].nunique().reset_index().rename(columns={'login_key':'unique_contributors'})
+    grp = unique_contributors(topic_company_pairs, ['topic', 'company_norm'])
     topic_top = grp.sort_values(['topic','unique_contributors'], ascending=[True, False]).groupby('topic').first().reset_index()
     topic_top = topic_top.sort_values('unique_contributors', ascending=False)
     top_n_topics = min(25, len(topic_top))
     plot_df = topic_top.head(top_n_topics).iloc[::-1]
     plt.figure(figsize=(10, max(6, top_n_topics*0.35)))
-    sns.barplot(data=plot_df, x='unique_contributors', y='topic', color='tab:blue')
-    for i, (_, row) in enumerate(plot_df.iterrows()):
-        plt.text(row['unique_contributors'] + max(plot_df['unique_contributors'])*0.01, i, str(row['company_norm']), va='center')
+    ax = sns.barplot(data=plot_df, x='unique_contributors', y='topic', color='tab:blue')
+    ax.bar_label(ax.containers[0], labels=plot_df['company_norm'].astype(str).tolist(), padding=3)
     plt.title('Top company per topic (contributors)')
     plt.xlabel('Unique contributors (top company)')
     plt.ylabel('Topic')
@@ -215,8 +325,12 @@ def main():
                 if k in t:
                     return layer
         return 'other'
-    df_topics['stack'] = df_topics['topic'].apply(map_topic_to_stack)
-    stack_pivot = df_topics[df_topics['topic'] != ''].groupby('stack')['login_key'].nunique().reset_index().rename(columns={'login_key':'unique_contributors'})
+    # few distinct topics: map each once, then look the rows up
+    stack_pairs = pd.concat(topic_pairs, ignore_index=True)
+    topics = stack_pairs['topic'].astype(str)
+    stack_of = {t: map_topic_to_stack(t) for t in topics.unique()}
+    stack_pairs = stack_pairs.assign(stack=topics.map(stack_of))[['stack', 'login_key']]
+    stack_pivot = unique_contributors([stack_pairs], 'stack')
     stack_pivot = stack_pivot.sort_values('unique_contributors', ascending=False)
     plt.figure(figsize=(8,4))
     sns.barplot(data=stack_pivot, x='stack', y='unique_contributors', palette='pastel')
@@ -231,12 +345,14 @@ def main():
 
     # 9) heatmap
     top_orgs = company_counts.head(30)['company_norm'].tolist()
-    heat_df = df_topics[df_topics['company_clean'] != '']
-    heat_df['company_norm'] = heat_df['company_clean'].apply(normalize_org)
-    heat_df = heat_df[heat_df['company_norm'].isin(top_orgs) & (heat_df['topic'] != '')]
-    pivot = heat_df.groupby(['topic','company_norm'])['login_key'].nunique().unstack(fill_value=0)
     top_topics = topic_counts.head(20)['topic'].tolist()
-    pivot = pivot.reindex(top_topics).fillna(0)
+    heat_df = pd.concat(topic_company_pairs, ignore_index=True)
+    heat_df = heat_df[heat_df['company_norm'].isin(top_orgs) & (heat_df['topic'] != '')]
+    # one column per top org seen with any topic; only the plotted topics are counted
+    orgs = np.sort(heat_df['company_norm'].unique())
+    heat_df = heat_df[heat_df['topic'].isin(top_topics)].drop_duplicates()
+    pivot = heat_df.groupby(['topic','company_norm'], observed=True).size().unstack(fill_value=0)
+    pivot = pivot.reindex(index=top_topics, columns=orgs, fill_value=0)
     plt.figure(figsize=(14,8))
     sns.heatmap(np.log1p(pivot), cmap='YlGnBu', linewidths=.5, annot=False)
     plt.title('Log(1+contributors) by topic (rows) and organization (cols)')
@@ -247,11 +363,10 @@ def main():
     print('Saved:', out_path)
 
     # 10) temporal
-    if 'created_at_dt' in df.columns and df['created_at_dt'].notna().any():
-        df['created_year'] = df['created_at_dt'].dt.year
-        year_counts = df.groupby('created_year')['login_key'].nunique().reset_index().dropna()
+    if year_pairs and any(len(p) for p in year_pairs):
+        year_counts = unique_contributors(year_pairs, 'created_year')
         plt.figure(figsize=(10,4))
-        sns.lineplot(data=year_counts, x='created_year', y='login_key', marker='o')
+        sns.lineplot(data=year_counts, x='created_year', y='unique_contributors', marker='o')
         plt.title('Number of unique contributors by account creation year')
         plt.xlabel('Year')
         plt.ylabel('Unique contributors')
@@ -262,25 +377,25 @@ def main():
         print('Saved:', out_path)
 
     # 11) followers vs repos
-    if 'followers' in df.columns and 'public_repos' in df.columns:
-        sample = df.dropna(subset=['followers','public_repos']).sample(n=min(10000, len(df)), random_state=42)
+    points = pd.concat(followers_repos, ignore_index=True) if followers_repos else None
+    if points is not None and len(points):
+        # hexbin density instead of one marker per contributor; zeros are clipped to 1 for the log axes
         plt.figure(figsize=(8,6))
-        sns.scatterplot(data=sample, x='public_repos', y='followers', alpha=0.6)
-        plt.xscale('symlog')
-        plt.yscale('symlog')
-        plt.xlabel('public_repos (symlog)')
-        plt.ylabel('followers (symlog)')
-        plt.title('Followers vs public_repos (sample)')
+        plt.hexbin(points['public_repos'].clip(lower=1).to_numpy(dtype=float), points['followers'].clip(lower=1).to_numpy(dtype=float),
+                   gridsize=60, xscale='log', yscale='log', bins='log', cmap='viridis', mincnt=1)
+        plt.colorbar(label='count (log)')
+        plt.xlabel('public_repos (log)')
+        plt.ylabel('followers (log)')
+        plt.title('Followers vs public_repos')
         out_path = fig_dir / 'followers_vs_repos.png'
         plt.tight_layout()
         plt.savefig(out_path, dpi=150, bbox_inches='tight')
         plt.close()
         print('Saved:', out_path)
 
-    # save cleaned csv
-    clean_out = by_topics / 'all_contributors_master_dedup_cleaned.csv'
-    df.to_csv(clean_out, index=False)
-    print('Saved cleaned CSV:', clean_out)
+    print('Saved cleaned table:', clean_out)
+    if WRITE_CLEANED_CSV:
+        print('Saved cleaned CSV:', clean_csv)
 
     print('Done')
 
@@ -1,9 +1,10 @@
 import os
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 from .src.github_scrape import scrape_repo
+from .src.utils import MAX_WORKERS, get_session, save_json
 from .src.dummy_source import write_dummy
 
 # Directory of this file (used to compute project root)
@@ -61,29 +62,39 @@ def main():
         "llm-ops",
         "open-source-ai",
     ]
-    from .src.topic_scrape import find_repos_by_topics, scrape_repos_prs, scrape_users_from_prs, aggregate_contributors_master
+    from .src.topic_scrape import find_repos_by_topics, scrape_repos_prs, scrape_users_from_prs, aggregate_contributors_master, UserPrefetcher
     manifest = {"run_timestamp": ts, "outputs": {}, "notes": "Add GITHUB_TOKEN for better rate limits."}
-    for owner, repo in targets:
-        repo_dir = os.path.join(out_dir, repo.lower())
-        os.makedirs(repo_dir, exist_ok=True)
-        try:
-            meta = scrape_repo(owner, repo, repo_dir, logger=logger)
-            manifest["outputs"][f"{owner}/{repo}"] = meta
-        except Exception as e:
-            logger.exception(f"Failed on {owner}/{repo}: {e}")
-            manifest["outputs"][f"{owner}/{repo}"] = {"error": str(e)}
+    # One pooled session for every GitHub call in the run
+    session = get_session()
+    # Each target is independent and I/O bound, so scrape them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = {}
+        for owner, repo in targets:
+            repo_dir = os.path.join(out_dir, repo.lower())
+            os.makedirs(repo_dir, exist_ok=True)
+            futures[ex.submit(scrape_repo, owner, repo, repo_dir, session=session, logger=logger)] = (owner, repo)
+        for fut in as_completed(futures):
+            owner, repo = futures[fut]
+            try:
+                meta = fut.result()
+                manifest["outputs"][f"{owner}/{repo}"] = meta
+            except Exception as e:
+                logger.exception(f"Failed on {owner}/{repo}: {e}")
+                manifest["outputs"][f"{owner}/{repo}"] = {"error": str(e)}
 
     # Discover repos by topic and save findings
     topics_out = os.path.join(out_dir, "by_topics")
     try:
-        repos = find_repos_by_topics(topics, topics_out, max_pages_per_topic=2, logger=logger)
+        repos = find_repos_by_topics(topics, topics_out, max_pages_per_topic=2, session=session, logger=logger)
         manifest["outputs"]["discovered_repos"] = {"count": len(repos), "path": topics_out}
-        # Scrape PRs for discovered repos (this will create per-repo folders under topics_out)
-        prs_meta = scrape_repos_prs(repos, os.path.join(topics_out, "prs"), logger=logger)
+        # Scrape PRs for discovered repos (this will create per-repo folders under topics_out),
+        # fetching PR authors' user profiles in the background as their PRs come in
+        with UserPrefetcher(topics_out, session=session, logger=logger) as prefetch:
+            prs_meta = scrape_repos_prs(repos, os.path.join(topics_out, "prs"), session=session, logger=logger, prefetch=prefetch)
         manifest["outputs"]["discovered_repos_prs"] = {"count": len(prs_meta), "path": os.path.join(topics_out, "prs")}
         # Collect user profiles for PR authors and write per-repo users CSVs/JSONs
         try:
-            users_index = scrape_users_from_prs(os.path.join(topics_out, "prs"), topics_out, logger=logger)
+            users_index = scrape_users_from_prs(os.path.join(topics_out, "prs"), topics_out, session=session, logger=logger)
             manifest["outputs"]["pr_users_index"] = {"count": len(users_index), "path": os.path.join(topics_out, "pr_users_index.json")}
         except Exception as e:
             logger.exception(f"Failed to scrape users from PRs: {e}")
@@ -101,8 +112,7 @@ def main():
         manifest["outputs"]["discovered_repos"] = {"error": str(e)}
 
     # 3) Save manifest
-    with open(os.path.join(out_dir, "MANIFEST.json"), "w", encoding="utf-8") as f:
-        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    save_json(manifest, os.path.join(out_dir, "MANIFEST.json"), pretty=True)
 
     logger.info("Pipeline finished.")
 
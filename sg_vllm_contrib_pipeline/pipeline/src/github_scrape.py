@@ -1,116 +1,192 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
-import time
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from .utils import make_session, save_json, get_json_with_retry, request_with_rate_limit
+from .utils import get_session, save_json, save_table, get_json_with_retry, request_with_rate_limit, response_json, fetch_many, graphql_batch, last_page, MAX_WORKERS, CSV_NULL_VALUES
 
 GITHUB_API = "https://api.github.com"
 
-def list_contributors(owner: str, repo: str, include_anon: bool=True, logger: Optional[logging.Logger]=None) -> List[Dict]:
-    session = make_session()
-    all_rows = []
-    page = 1
-    while True:
-        url = f"{GITHUB_API}/repos/{owner}/{repo}/contributors"
-        params = {"per_page": 100, "page": page}
-        if include_anon:
-            params["anon"] = "true"
-        r = request_with_rate_limit(session, 'GET', url, params=params, timeout=60, logger=logger)
+# Logins resolved per GraphQL request (one aliased `user(login:)` node each)
+GRAPHQL_USERS_PER_QUERY = 100
+# Below this many logins the plain REST lookups are used even when GraphQL is available
+GRAPHQL_MIN_LOGINS = 8
+# `repositories` is restricted to owned repos: REST's public_repos does not count collaborations
+GRAPHQL_USER_FIELDS = (
+    "login databaseId name company websiteUrl location email isHireable bio twitterUsername "
+    "createdAt updatedAt repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount } "
+    "followers { totalCount } following { totalCount }"
+)
+
+def list_contributors(owner: str, repo: str, include_anon: bool=True, session=None, logger: Optional[logging.Logger]=None) -> List[Dict]:
+    if session is None:
+        session = get_session()
+    url = f"{GITHUB_API}/repos/{owner}/{repo}/contributors"
+    params = {"per_page": 100}
+    if include_anon:
+        params["anon"] = "true"
+
+    def get_page(page: int):
+        r = request_with_rate_limit(session, 'GET', url, params={**params, "page": page}, timeout=60, logger=logger)
         if r.status_code != 200:
             if logger: logger.warning(f"Failed to list contributors p{page}: {r.status_code} {getattr(r, 'text', '')[:200]}")
             r.raise_for_status()
         rows = r.json()
-        if not rows:
-            break
-        all_rows.extend(rows)
         if logger: logger.info(f"Fetched {len(rows)} contributors on page {page}")
-        page += 1
-        time.sleep(0.2)
+        return rows, r
+
+    # Page 1 tells us how many pages there are; fetch the rest concurrently
+    rows, first = get_page(1)
+    all_rows = list(rows)
+    last = last_page(first)
+    if last and last > 1:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            for rows, _ in ex.map(get_page, range(2, last + 1)):
+                all_rows.extend(rows)
     return all_rows
 
-def contributor_stats(owner: str, repo: str, logger: Optional[logging.Logger]=None) -> List[Dict]:
-    session = make_session()
+def contributor_stats(owner: str, repo: str, session=None, logger: Optional[logging.Logger]=None) -> List[Dict]:
+    if session is None:
+        session = get_session()
     url = f"{GITHUB_API}/repos/{owner}/{repo}/stats/contributors"
     data = get_json_with_retry(session, url, logger=logger)
     return data
 
-def users_details(user_logins: List[str], logger: Optional[logging.Logger]=None) -> List[Dict]:
-    session = make_session()
+def _graphql_user_to_rest(u: Dict) -> Dict:
+    """Map a GraphQL User node onto a subset of the REST `/users/{login}` keys.
+
+    Only the keys below are filled (those `to_dataframe_users` keeps, plus id and type); the rest of
+    the REST payload (URLs, node_id, avatar, gists, ...) is absent, so rows in users.json differ by source.
+    """
+    return {
+        "login": u.get("login"),
+        "id": u.get("databaseId"),
+        "type": "User",
+        "name": u.get("name"),
+        "company": u.get("company"),
+        "blog": u.get("websiteUrl") or "",
+        "location": u.get("location"),
+        "email": u.get("email") or None,
+        "hireable": u.get("isHireable") or None,
+        "bio": u.get("bio"),
+        "twitter_username": u.get("twitterUsername"),
+        "public_repos": (u.get("repositories") or {}).get("totalCount"),
+        "followers": (u.get("followers") or {}).get("totalCount"),
+        "following": (u.get("following") or {}).get("totalCount"),
+        "created_at": u.get("createdAt"),
+        "updated_at": u.get("updatedAt"),
+    }
+
+def users_details(user_logins: List[str], session=None, logger: Optional[logging.Logger]=None) -> List[Dict]:
+    """Fetch user profiles keyed like the REST `/users/{login}` payload.
+
+    With a token and more than GRAPHQL_MIN_LOGINS logins, they are resolved through batched GraphQL
+    queries; anything GraphQL cannot resolve (bots, organizations, anonymous names), small lookups
+    and all logins on anonymous runs go through REST. GraphQL-resolved profiles carry only a subset
+    of the REST keys (see `_graphql_user_to_rest`). Callers holding a user cache (see
+    `topic_scrape.load_user_cache`) pass only the logins it is missing.
+    """
+    if session is None:
+        session = get_session()
+    user_logins = [login for login in user_logins if login]
     out = []
-    for login in tqdm(user_logins, desc="users", leave=False):
-        if not login:
-            continue
-        url = f"{GITHUB_API}/users/{login}"
-        r = request_with_rate_limit(session, 'GET', url, timeout=60, logger=logger)
+    if "Authorization" in session.headers and len(user_logins) > GRAPHQL_MIN_LOGINS:
+        nodes = graphql_batch(session, user_logins, GRAPHQL_USER_FIELDS, batch_size=GRAPHQL_USERS_PER_QUERY, logger=logger)
+        found = {login: _graphql_user_to_rest(u) for login, u in nodes.items()}
+        out.extend(found[login] for login in user_logins if login in found)
+        user_logins = [login for login in user_logins if login not in found]
+
+    # One small GET per login: keep several in flight on the shared connection pool
+    urls = {f"{GITHUB_API}/users/{login}": login for login in user_logins}
+    responses = dict(tqdm(fetch_many(session, urls, timeout=60, logger=logger), total=len(urls), desc="users", leave=False))
+    for url, login in urls.items():
+        r = responses[url]
         if r.status_code != 200:
             if logger: logger.info(f"Failed user {login}: {r.status_code}")
             continue
         try:
-            out.append(r.json())
+            out.append(response_json(r))
         except Exception:
             if logger: logger.warning(f"Failed to parse user JSON for {login}")
             continue
-        time.sleep(0.1)
     return out
 
+def _int_column(rows: List[Dict], key: str) -> pd.arrays.IntegerArray:
+    """Nullable Int64 column; anything that is not an int (missing, None) becomes <NA>."""
+    values = [r.get(key) for r in rows]
+    return pd.array([v if isinstance(v, int) else None for v in values], dtype="Int64")
+
+_NULL_TEXT = frozenset(CSV_NULL_VALUES)
+
+def _text_column(rows: List[Dict], key: str) -> List[Optional[str]]:
+    """Text column with missing-value markers ("", "None", "N/A", ...) stored as None, as pd.read_csv reads them."""
+    values = [r.get(key) for r in rows]
+    return [None if isinstance(v, str) and v in _NULL_TEXT else v for v in values]
+
 def to_dataframe_contributors(rows: List[Dict]) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame()
-    # Flatten a few useful fields
-    records = []
-    for r in rows:
-        record = {
-            "login": r.get("login"),
-            "type": r.get("type"),
-            "contributions": r.get("contributions"),
-            "id": (r.get("id") if isinstance(r.get("id"), int) else None),
-            "html_url": r.get("html_url"),
-        }
-        # Anonymous contributors will not have login/id; their 'name' might appear in 'login' field when anon=true
-        if record["login"] is None and isinstance(r, dict):
-            record["login"] = r.get("name")  # fallback
-        records.append(record)
-    return pd.DataFrame.from_records(records)
+    # Flatten a few useful fields, one column at a time.
+    # Anonymous contributors will not have login/id; their 'name' might appear in 'login' field when anon=true
+    return pd.DataFrame({
+        "login": [r.get("login") if r.get("login") is not None else r.get("name") for r in rows],
+        "type": pd.Categorical([r.get("type") for r in rows]),
+        "contributions": np.fromiter((r.get("contributions") or 0 for r in rows), dtype=np.int64, count=len(rows)),
+        "id": _int_column(rows, "id"),
+        "html_url": [r.get("html_url") for r in rows],
+    })
 
 def to_dataframe_users(rows: List[Dict]) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame()
     keep = ["login","name","company","blog","location","email","hireable","bio","twitter_username","public_repos","followers","following","created_at","updated_at"]
-    return pd.DataFrame([{k: r.get(k) for k in keep} for r in rows])
+    counts = {"public_repos", "followers", "following"}
+    columns = {}
+    for k in keep:
+        if k in counts:
+            columns[k] = _int_column(rows, k)
+        elif k == "hireable":
+            columns[k] = [r.get(k) for r in rows]
+        else:
+            # literal "None"/"N/A" profile text reads as missing whether the table comes back from CSV or Parquet
+            columns[k] = _text_column(rows, k)
+    return pd.DataFrame(columns)
 
-def scrape_repo(owner: str, repo: str, out_dir: str, logger: Optional[logging.Logger]=None) -> Dict:
+def scrape_repo(owner: str, repo: str, out_dir: str, session=None, logger: Optional[logging.Logger]=None) -> Dict:
+    if session is None:
+        session = get_session()
     os.makedirs(out_dir, exist_ok=True)
     if logger: logger.info(f"Scraping {owner}/{repo} -> {out_dir}")
 
     # Contributors (paginated list)
-    contributors_rows = list_contributors(owner, repo, include_anon=True, logger=logger)
+    contributors_rows = list_contributors(owner, repo, include_anon=True, session=session, logger=logger)
     df_contrib = to_dataframe_contributors(contributors_rows)
-    contrib_path = os.path.join(out_dir, "contributors.csv")
-    df_contrib.to_csv(contrib_path, index=False)
+    contrib_path, contrib_parquet = save_table(df_contrib, os.path.join(out_dir, "contributors"), logger=logger)
 
     # Contributor stats (weekly additions/deletions/commits)
-    stats_rows = contributor_stats(owner, repo, logger=logger)
+    stats_rows = contributor_stats(owner, repo, session=session, logger=logger)
     stats_path = os.path.join(out_dir, "contributor_stats.json")
     save_json(stats_rows, stats_path)
 
     # User details (for logins we have)
     logins = [x for x in df_contrib["login"].dropna().unique().tolist() if isinstance(x, str)]
-    user_rows = users_details(logins, logger=logger)
+    user_rows = users_details(logins, session=session, logger=logger)
     df_users = to_dataframe_users(user_rows)
-    users_path = os.path.join(out_dir, "users.csv")
-    df_users.to_csv(users_path, index=False)
+    users_path, users_parquet = save_table(df_users, os.path.join(out_dir, "users"), logger=logger)
 
     meta = {
         "owner": owner,
         "repo": repo,
         "outputs": {
             "contributors_csv": contrib_path,
+            "contributors_parquet": contrib_parquet,
             "contributor_stats_json": stats_path,
-            "users_csv": users_path
+            "users_csv": users_path,
+            "users_parquet": users_parquet
         },
         "counts": {
             "contributors": int(len(df_contrib)),
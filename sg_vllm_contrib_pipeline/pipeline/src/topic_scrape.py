@@ -1,28 +1,71 @@
 import os
+import re
+import math
 import time
+import queue
 import logging
-from typing import List, Dict, Optional, Set, Tuple
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 
-from .utils import make_session, save_json, get_json_with_retry, request_with_rate_limit
-from .github_scrape import users_details, to_dataframe_users
+from .utils import get_session, save_json, save_table, load_json, jsonl_line, iter_jsonl, iter_json_array, get_json_with_retry, request_with_rate_limit, last_page, MAX_WORKERS, CSV_NULL_VALUES
+from .github_scrape import users_details, to_dataframe_users, GRAPHQL_USERS_PER_QUERY
 from typing import Iterable
 import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 GITHUB_API = "https://api.github.com"
-
-
-def search_repos_for_topic(topic: str, session=None, max_pages: int = 5, logger: Optional[logging.Logger] = None) -> List[Dict]:
+# Per-run cache of fetched user profiles, keyed by login
+USER_CACHE_FILENAME = ".user_cache.json"
+# Free-text columns of the per-repo user/contributor CSVs; read as strings so a repo whose
+# values happen to look numeric (e.g. an all-digit login) still concatenates with the rest
+_TEXT_COLUMNS = ("login", "name", "company", "blog", "location", "email", "bio", "twitter_username",
+                 "created_at", "updated_at", "type", "html_url")
+# How long the user prefetcher waits for more logins before fetching a partial batch
+PREFETCH_BATCH_WAIT = 2.0
+# Combined table of every repo's users plus repo metadata, under by_topics_dir
+MASTER_BASENAME = "all_contributors_master"
+# Column layout of the master table: the to_dataframe_users columns followed by the repo metadata
+_USERS_SCHEMA = pa.schema(
+    [(c, pa.string()) for c in ("login", "name", "company", "blog", "location", "email")]
+    + [("hireable", pa.bool_()), ("bio", pa.string()), ("twitter_username", pa.string())]
+    + [(c, pa.int64()) for c in ("public_repos", "followers", "following")]
+    + [("created_at", pa.string()), ("updated_at", pa.string())]
+)
+_MASTER_SCHEMA = pa.schema(
+    list(_USERS_SCHEMA)
+    + [(c, pa.string()) for c in ("repo_dir", "repo_name", "full_name", "owner")]
+    + [("topics", pa.list_(pa.string())), ("matched_topics", pa.list_(pa.string()))]
+)
+# Logins ending in "bot" or "[bot]" (GitHub App accounts) are treated as automation
+_BOT_LOGIN_RE = re.compile(r"(?:\[bot\]|bot)$", re.IGNORECASE)
+# Accept header under which repo payloads (search items included) carry their `topics`
+TOPICS_ACCEPT = {"Accept": "application/vnd.github.mercy-preview+json"}
+# The Search API pages through at most this many results per query
+SEARCH_RESULT_CAP = 1000
+# Lower bound of the creation-date range split up by the partitioned search
+SEARCH_EPOCH = datetime(2008, 1, 1, tzinfo=timezone.utc)
+
+
+def search_repos_for_topic(topic: str, session=None, max_pages: Optional[int] = 5, logger: Optional[logging.Logger] = None) -> List[Dict]:
     """Search repositories for a given topic using the search API.
     Returns a list of repo dicts (as returned by the search endpoint).
+    With ``max_pages=None`` every matching repo is returned, not just the first pages
+    (see `_search_partitioned`).
     """
     if session is None:
-        session = make_session()
+        session = get_session()
+    if max_pages is None:
+        return _search_partitioned(topic, session=session, logger=logger)
     all_items = []
     for page in range(1, max_pages + 1):
         url = f"{GITHUB_API}/search/repositories"
         params = {"q": f"topic:{topic}", "per_page": 100, "page": page}
-        r = request_with_rate_limit(session, 'GET', url, params=params, timeout=60, logger=logger)
+        r = request_with_rate_limit(session, 'GET', url, params=params, headers=TOPICS_ACCEPT, timeout=60, logger=logger)
         if r.status_code != 200:
             if logger:
                 logger.warning(f"Search repos for topic {topic} page {page} failed: {r.status_code} {getattr(r, 'text', '')[:200]}")
@@ -33,18 +76,59 @@ def search_repos_for_topic(topic: str, session=None, max_pages: int = 5, logger:
             break
         all_items.extend(items)
         if logger: logger.info(f"Found {len(items)} repos for topic {topic} on page {page}")
-        # Respectful pause
-        time.sleep(0.2)
     return all_items
 
 
+def _search_created_range(topic: str, lo: datetime, hi: datetime, page: int, session, logger: Optional[logging.Logger]=None) -> Tuple[int, List[Dict]]:
+    """Fetch one page of `topic:<topic> created:<lo>..<hi>`; returns (total_count, items)."""
+    url = f"{GITHUB_API}/search/repositories"
+    q = f"topic:{topic} created:{lo:%Y-%m-%dT%H:%M:%SZ}..{hi:%Y-%m-%dT%H:%M:%SZ}"
+    r = request_with_rate_limit(session, 'GET', url, params={"q": q, "per_page": 100, "page": page}, headers=TOPICS_ACCEPT, timeout=60, logger=logger)
+    if r.status_code != 200:
+        if logger: logger.warning(f"Search {q!r} page {page} failed: {r.status_code} {getattr(r, 'text', '')[:200]}")
+        return 0, []
+    data = r.json()
+    return data.get("total_count", 0), data.get("items", [])
+
+
+def _search_partitioned(topic: str, session, logger: Optional[logging.Logger]=None) -> List[Dict]:
+    """Collect every repo for a topic by bisecting the creation-date range until each slice
+    reports at most SEARCH_RESULT_CAP results, then paging through each slice.
+    Slices are probed and paged concurrently.
+    """
+    items: List[Dict] = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        pending = {}
+
+        def submit(lo: datetime, hi: datetime, page: int):
+            pending[ex.submit(_search_created_range, topic, lo, hi, page, session, logger)] = (lo, hi, page)
+
+        submit(SEARCH_EPOCH, datetime.now(timezone.utc).replace(microsecond=0), 1)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                lo, hi, page = pending.pop(fut)
+                total, rows = fut.result()
+                if page == 1 and total > SEARCH_RESULT_CAP and hi - lo > timedelta(seconds=1):
+                    # Too many to page through: split the range and search both halves instead
+                    mid = (lo + (hi - lo) / 2).replace(microsecond=0)
+                    submit(lo, mid, 1)
+                    submit(mid + timedelta(seconds=1), hi, 1)
+                    continue
+                items.extend(rows)
+                if page == 1:
+                    for p in range(2, math.ceil(min(total, SEARCH_RESULT_CAP) / 100) + 1):
+                        submit(lo, hi, p)
+    if logger: logger.info(f"Found {len(items)} repos for topic {topic} across all creation dates")
+    return items
+
+
 def get_repo_topics(owner: str, repo: str, session=None, logger: Optional[logging.Logger]=None) -> List[str]:
     if session is None:
-        session = make_session()
+        session = get_session()
     url = f"{GITHUB_API}/repos/{owner}/{repo}/topics"
     # Topics endpoint requires a preview accept header; override for this request
-    headers = {"Accept": "application/vnd.github.mercy-preview+json"}
-    r = request_with_rate_limit(session, 'GET', url, headers=headers, timeout=30, logger=logger)
+    r = request_with_rate_limit(session, 'GET', url, headers=TOPICS_ACCEPT, timeout=30, logger=logger)
     if r.status_code != 200:
         if logger: logger.warning(f"Failed to fetch topics for {owner}/{repo}: {r.status_code}")
         return []
@@ -52,25 +136,28 @@ def get_repo_topics(owner: str, repo: str, session=None, logger: Optional[loggin
     return data.get("names", [])
 
 
-def list_pull_requests(owner: str, repo: str, session=None, logger: Optional[logging.Logger]=None) -> List[Dict]:
+def list_pull_requests(owner: str, repo: str, session=None, logger: Optional[logging.Logger]=None) -> Iterator[Dict]:
+    """Yield every PR of a repo (all states) as pages arrive, without holding the full list."""
     if session is None:
-        session = make_session()
-    out = []
-    page = 1
-    while True:
-        url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
-        params = {"state": "all", "per_page": 100, "page": page}
-        r = request_with_rate_limit(session, 'GET', url, params=params, timeout=60, logger=logger)
+        session = get_session()
+    url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
+    params = {"state": "all", "per_page": 100}
+
+    def get_page(page: int):
+        r = request_with_rate_limit(session, 'GET', url, params={**params, "page": page}, timeout=60, logger=logger)
         if r.status_code != 200:
             if logger: logger.warning(f"Failed to list PRs for {owner}/{repo} p{page}: {r.status_code}")
-            break
-        rows = r.json()
-        if not rows:
-            break
-        out.extend(rows)
-        page += 1
-        time.sleep(0.2)
-    return out
+            return [], r
+        return r.json(), r
+
+    # Page 1 tells us how many pages there are; fetch the rest concurrently
+    rows, first = get_page(1)
+    yield from rows
+    last = last_page(first) if first.status_code == 200 else None
+    if last and last > 1:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            for rows, _ in ex.map(get_page, range(2, last + 1)):
+                yield from rows
 
 
 def is_human_user(user_obj: Dict) -> bool:
@@ -80,24 +167,34 @@ def is_human_user(user_obj: Dict) -> bool:
     # GitHub returns type 'User' for real users and 'Bot' for bots
     if user_obj.get("type") != "User":
         return False
-    login = user_obj.get("login", "")
     # Exclude typical bot suffixes or usernames that clearly contain 'bot'
-    if login.lower().endswith("[bot]") or login.lower().endswith("bot"):
+    if _BOT_LOGIN_RE.search(user_obj.get("login") or ""):
         return False
     return True
 
 
-def find_repos_by_topics(topics: List[str], out_dir: str, max_pages_per_topic: int = 3, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
+def find_repos_by_topics(topics: List[str], out_dir: str, max_pages_per_topic: Optional[int] = 3, session=None, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
     """Search GitHub for repositories matching any of the provided topics.
     Returns a dict keyed by full_name (owner/repo) with metadata including topics found.
     Also writes a `repos_by_topic.json` file in out_dir.
+    Pass ``max_pages_per_topic=None`` to collect every repo for each topic.
     """
     os.makedirs(out_dir, exist_ok=True)
-    session = make_session()
+    if session is None:
+        session = get_session()
     repos: Dict[str, Dict] = {}
-    for topic in topics:
+
+    def search(topic: str) -> List[Dict]:
         if logger: logger.info(f"Searching topic: {topic}")
-        items = search_repos_for_topic(topic, session=session, max_pages=max_pages_per_topic, logger=logger)
+        return search_repos_for_topic(topic, session=session, max_pages=max_pages_per_topic, logger=logger)
+
+    def fetch_topics(info: Dict) -> List[str]:
+        return get_repo_topics(info["owner"], info["name"], session=session, logger=logger)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        topic_items = list(ex.map(search, topics))
+    # Merge in topic order so the resulting dict is deterministic
+    for topic, items in zip(topics, topic_items):
         for item in items:
             full = item.get("full_name")
             if not full:
@@ -111,19 +208,21 @@ def find_repos_by_topics(topics: List[str], out_dir: str, max_pages_per_topic: i
                     "description": item.get("description"),
                     "stargazers_count": item.get("stargazers_count", 0),
                     "forks_count": item.get("forks_count", 0),
-                    "topics": [],
+                    # search items carry the full topics list (requested with TOPICS_ACCEPT)
+                    "topics": item.get("topics") or [],
                     "matched_topics": set()
                 }
             repos[full]["matched_topics"].add(topic)
-    # Fetch full topics list per repo (quiet pause between requests)
-    for full, info in repos.items():
-        owner = info["owner"]
-        repo = info["name"]
-        t = get_repo_topics(owner, repo, session=session, logger=logger)
-        info["topics"] = t
+    # Fetch the topics list only for repos whose search item came without one
+    missing = [info for info in repos.values() if not info["topics"]]
+    if missing:
+        if logger: logger.info(f"Fetching topics for {len(missing)} of {len(repos)} repos")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            for info, t in zip(missing, ex.map(fetch_topics, missing)):
+                info["topics"] = t
+    for info in repos.values():
         # normalize matched_topics to list
         info["matched_topics"] = sorted(list(info["matched_topics"]))
-        time.sleep(0.1)
 
     out_path = os.path.join(out_dir, "repos_by_topic.json")
     # Convert any non-serializable sets
@@ -133,23 +232,52 @@ def find_repos_by_topics(topics: List[str], out_dir: str, max_pages_per_topic: i
     return serializable
 
 
-def scrape_repos_prs(repos: Dict[str, Dict], out_dir: str, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
+def scrape_repos_prs(repos: Dict[str, Dict], out_dir: str, session=None, logger: Optional[logging.Logger]=None, prefetch: Optional["UserPrefetcher"]=None) -> Dict[str, Dict]:
     """For each repo in repos (dict keyed by full_name), fetch PRs and save per-repo outputs.
-    Returns a metadata dict summarizing results.
+    Returns a metadata dict summarizing results. PR author logins are handed to `prefetch`
+    (when given) as they stream in, so user profiles are fetched while pagination continues.
     """
-    session = make_session()
+    if session is None:
+        session = get_session()
     results = {}
     os.makedirs(out_dir, exist_ok=True)
-    for full, info in repos.items():
-        owner, name = full.split("/")
-        repo_dir = os.path.join(out_dir, name)
-        os.makedirs(repo_dir, exist_ok=True)
-        if logger: logger.info(f"Scraping PRs for {full}")
-        prs = list_pull_requests(owner, name, session=session, logger=logger)
-        # Filter human contributors from PR authors
-        pr_records = []
-        human_logins = set()
-        for pr in prs:
+    # Output folders are keyed by repo name alone, so repos sharing a name (a/serve, b/serve) run one
+    # after another in the same task, in input order (the last one's PRs end up in the folder, as
+    # when everything ran sequentially); distinct names stream to their own files concurrently
+    by_name: Dict[str, List[str]] = {}
+    for full in repos:
+        by_name.setdefault(full.split("/")[1], []).append(full)
+
+    def save_group(fulls: List[str]) -> Dict[str, Dict]:
+        metas = {}
+        for full in fulls:
+            if logger: logger.info(f"Scraping PRs for {full}")
+            metas[full] = _save_repo_prs(full, repos[full], out_dir, session=session, logger=logger, prefetch=prefetch)
+        return metas
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        done = {}
+        for metas in ex.map(save_group, by_name.values()):
+            done.update(metas)
+    results.update((full, done[full]) for full in repos)
+    # Save aggregate results
+    agg_path = os.path.join(out_dir, "repos_prs_summary.json")
+    save_json(results, agg_path, pretty=True)
+    if logger: logger.info(f"Wrote PR summaries to {agg_path}")
+    return results
+
+
+def _save_repo_prs(full: str, info: Dict, out_dir: str, session=None, logger: Optional[logging.Logger]=None, prefetch: Optional["UserPrefetcher"]=None) -> Dict:
+    """Stream one repo's PRs into `pull_requests.jsonl` (one record per line) and return its summary."""
+    owner, name = full.split("/")
+    repo_dir = os.path.join(out_dir, name)
+    os.makedirs(repo_dir, exist_ok=True)
+    prs_path = os.path.join(repo_dir, "pull_requests.jsonl")
+    # Filter human contributors from PR authors
+    num_prs = 0
+    human_logins = set()
+    with open(prs_path, "wb") as fh:
+        for pr in list_pull_requests(owner, name, session=session, logger=logger):
             author = pr.get("user") or {}
             is_human = is_human_user(author)
             record = {
@@ -164,125 +292,282 @@ def scrape_repos_prs(repos: Dict[str, Dict], out_dir: str, logger: Optional[logg
                 "state": pr.get("state"),
                 "html_url": pr.get("html_url"),
             }
-            pr_records.append(record)
+            fh.write(jsonl_line(record))
+            num_prs += 1
+            if prefetch is not None and record["user"]:
+                prefetch.put(record["user"])
             if is_human:
                 human_logins.add(author.get("login"))
-        # Save PRs
-        prs_path = os.path.join(repo_dir, "pull_requests.json")
-        save_json(pr_records, prs_path)
-
-        # Save a summary
-        meta = {
-            "full_name": full,
-            "owner": owner,
-            "name": name,
-            "num_prs": len(pr_records),
-            "human_contributors": sorted(list(human_logins)),
-            "topics": info.get("topics", []),
-            "matched_topics": info.get("matched_topics", []),
-            "outputs": {
-                "prs_json": prs_path
-            }
+
+    # Save a summary
+    meta = {
+        "full_name": full,
+        "owner": owner,
+        "name": name,
+        "num_prs": num_prs,
+        "human_contributors": sorted(list(human_logins)),
+        "topics": info.get("topics", []),
+        "matched_topics": info.get("matched_topics", []),
+        "outputs": {
+            "prs_jsonl": prs_path
         }
-        results[full] = meta
-        if logger: logger.info(f"Saved PRs for {full}: {meta['num_prs']} PRs, {len(human_logins)} human contributors")
-        time.sleep(0.1)
-    # Save aggregate results
-    agg_path = os.path.join(out_dir, "repos_prs_summary.json")
-    save_json(results, agg_path)
-    if logger: logger.info(f"Wrote PR summaries to {agg_path}")
-    return results
+    }
+    if logger: logger.info(f"Saved PRs for {full}: {meta['num_prs']} PRs, {len(human_logins)} human contributors")
+    return meta
+
+
+def _pr_logins(pr_rows: Iterable[Dict]) -> Set[str]:
+    """Collect logins from PR 'user' (could be dict or string) and optionally 'merged_by'."""
+    logins: Set[str] = set()
+    for pr in pr_rows:
+        user = pr.get("user")
+        # support both shapes: {'login': 'x'} or a plain string 'x'
+        if isinstance(user, dict):
+            login = user.get("login")
+            if login:
+                logins.add(login)
+        elif isinstance(user, str):
+            logins.add(user)
+        # merged_by is less common in saved summaries, but handle both shapes too
+        merged_by = pr.get("merged_by")
+        if isinstance(merged_by, dict):
+            mlogin = merged_by.get("login")
+            if mlogin:
+                logins.add(mlogin)
+        elif isinstance(merged_by, str):
+            logins.add(merged_by)
+    return logins
+
+
+def load_user_cache(by_topics_dir: str) -> Dict[str, Dict]:
+    """Load the login -> user JSON cache shared across repos (empty if missing or unreadable)."""
+    path = os.path.join(by_topics_dir, USER_CACHE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        return load_json(path)
+    except Exception:
+        return {}
+
+
+def _index_repos_by_name(repos_map: Dict[str, Dict]) -> Dict[str, Tuple[str, Dict]]:
+    """Map repo name -> (full_name, info). Per-repo folders are named by repo name only, so when
+    several owners share a name the first entry of `repos_by_topic.json` wins."""
+    by_name = {}
+    for full, info in repos_map.items():
+        by_name.setdefault(info.get('name'), (full, info))
+    return by_name
+
+
+def _repo_columns(repo_dir: str, repo_name: str, repos_by_name: Dict[str, Tuple[str, Dict]], n: int) -> Dict[str, pa.Array]:
+    """Repo metadata columns (from `repos_by_topic.json`) repeated for the `n` users of one repo."""
+    full_match = repos_by_name.get(repo_name)
+    owner = full_match[1]['owner'] if full_match else None
+    full_name = full_match[0] if full_match else None
+    topics = list(full_match[1].get('topics', [])) if full_match else []
+    matched = list(full_match[1].get('matched_topics', [])) if full_match else []
+    return {
+        'repo_dir': pa.array([repo_dir] * n, pa.string()),
+        'repo_name': pa.array([repo_name] * n, pa.string()),
+        'full_name': pa.array([full_name] * n, pa.string()),
+        'owner': pa.array([owner] * n, pa.string()),
+        'topics': pa.array([topics] * n, pa.list_(pa.string())),
+        'matched_topics': pa.array([matched] * n, pa.list_(pa.string())),
+    }
+
+
+class UserPrefetcher:
+    """Fetch user profiles in the background while PRs are still being scraped.
+
+    Logins passed to `put` are batched (up to GRAPHQL_USERS_PER_QUERY, or whatever arrived within
+    PREFETCH_BATCH_WAIT seconds) and resolved with `users_details` on a worker thread. On `close`
+    (or leaving the `with` block) the queue is drained and the profiles are written to the
+    ``<by_topics_dir>/.user_cache.json`` that `scrape_users_from_prs` reads, so that step only
+    fetches logins the prefetcher missed.
+    """
 
+    def __init__(self, by_topics_dir: str, session=None, logger: Optional[logging.Logger]=None):
+        self.by_topics_dir = by_topics_dir
+        self.session = session if session is not None else get_session()
+        self.logger = logger
+        self.cache = load_user_cache(by_topics_dir)
+        self._seen: Set[str] = set(self.cache)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="user-prefetch", daemon=True)
+        self._thread.start()
+
+    def put(self, login: str):
+        with self._lock:
+            if login in self._seen:
+                return
+            self._seen.add(login)
+        self._queue.put(login)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        os.makedirs(self.by_topics_dir, exist_ok=True)
+        save_json(self.cache, os.path.join(self.by_topics_dir, USER_CACHE_FILENAME))
+        if self.logger: self.logger.info(f"Prefetched {len(self.cache)} user profiles")
+
+    def __enter__(self) -> "UserPrefetcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        closed = False
+        while not closed:
+            batch: List[str] = []
+            deadline = None
+            while len(batch) < GRAPHQL_USERS_PER_QUERY:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    login = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if login is None:
+                    closed = True
+                    break
+                batch.append(login)
+                if deadline is None:
+                    deadline = time.monotonic() + PREFETCH_BATCH_WAIT
+            if batch:
+                self._fetch(batch)
+
+    def _fetch(self, logins: List[str]):
+        try:
+            users = users_details(logins, session=self.session, logger=self.logger)
+        except Exception as e:
+            # whatever is missing is fetched again by scrape_users_from_prs
+            if self.logger: self.logger.warning(f"User prefetch of {len(logins)} logins failed: {e}")
+            return
+        for user in users:
+            self.cache[user.get("login")] = user
 
-def scrape_users_from_prs(prs_parent_dir: str, by_topics_dir: str, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
-    """Read per-repo `pull_requests.json` files under `prs_parent_dir`, collect unique user logins
+
+def scrape_users_from_prs(prs_parent_dir: str, by_topics_dir: str, session=None, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
+    """Read per-repo `pull_requests.jsonl` files under `prs_parent_dir`, collect unique user logins
     (PR authors and merged_by when present), fetch their GitHub user details and save per-repo
     `users.json` and `contributors.csv` files. Also returns a map of repo -> users fetched.
-    ``prs_parent_dir`` expected layout: <by_topics_dir>/prs/<repo_name>/pull_requests.json
+    ``prs_parent_dir`` expected layout: <by_topics_dir>/prs/<repo_name>/pull_requests.jsonl
+    (a legacy `pull_requests.json` array is read when no JSONL file exists).
     ``by_topics_dir`` is used to write `repos_by_topic.csv` (if `repos_by_topic.json` exists).
+    User profiles are fetched once per login across all repos and kept in
+    ``<by_topics_dir>/.user_cache.json`` so re-runs only fetch logins not seen before.
+    Each repo's users, with its repo metadata attached, are also appended to
+    ``<by_topics_dir>/all_contributors_master.parquet``, which `aggregate_contributors_master`
+    then only has to convert to CSV.
     """
     os.makedirs(prs_parent_dir, exist_ok=True)
-    session = make_session()
+    if session is None:
+        session = get_session()
     results = {}
-    # iterate subdirectories in prs_parent_dir
-    for entry in sorted(os.listdir(prs_parent_dir)):
-        repo_dir = os.path.join(prs_parent_dir, entry)
-        if not os.path.isdir(repo_dir):
-            continue
-        prs_path = os.path.join(repo_dir, "pull_requests.json")
-        if not os.path.exists(prs_path):
-            if logger: logger.info(f"No pull_requests.json for {entry}, skipping")
-            continue
-        if logger: logger.info(f"Collecting users from PRs in {entry}")
+    user_cache = load_user_cache(by_topics_dir)
+    repos_by_topic_json = os.path.join(by_topics_dir, "repos_by_topic.json")
+    repos_map = {}
+    if os.path.exists(repos_by_topic_json):
         try:
-            with open(prs_path, "r", encoding="utf-8") as fh:
-                pr_rows = json.load(fh)
+            repos_map = load_json(repos_by_topic_json)
         except Exception as e:
-            if logger: logger.warning(f"Failed to read {prs_path}: {e}")
-            continue
+            if logger: logger.warning(f"Failed to read {repos_by_topic_json}: {e}")
+    # written under a temporary name and renamed once complete, so an interrupted run never
+    # leaves a partial master behind for aggregate_contributors_master to pick up
+    os.makedirs(by_topics_dir, exist_ok=True)
+    master_path = os.path.join(by_topics_dir, f"{MASTER_BASENAME}.parquet")
+    master_tmp = f"{master_path}.tmp"
+    repos_by_name = _index_repos_by_name(repos_map)
+    master_writer = pq.ParquetWriter(master_tmp, _MASTER_SCHEMA, compression="zstd")
+    completed = False
+    try:
+        # iterate subdirectories in prs_parent_dir
+        for entry in sorted(os.listdir(prs_parent_dir)):
+            repo_dir = os.path.join(prs_parent_dir, entry)
+            if not os.path.isdir(repo_dir):
+                continue
+            prs_path = os.path.join(repo_dir, "pull_requests.jsonl")
+            if not os.path.exists(prs_path):
+                # runs before JSONL output wrote a single JSON array
+                prs_path = os.path.join(repo_dir, "pull_requests.json")
+            if not os.path.exists(prs_path):
+                if logger: logger.info(f"No pull_requests.jsonl for {entry}, skipping")
+                continue
+            if logger: logger.info(f"Collecting users from PRs in {entry}")
+            try:
+                pr_rows = iter_jsonl(prs_path) if prs_path.endswith(".jsonl") else iter_json_array(prs_path)
+                logins = _pr_logins(pr_rows)
+            except Exception as e:
+                if logger: logger.warning(f"Failed to read {prs_path}: {e}")
+                continue
 
-        # collect logins from PR 'user' (could be dict or string) and optionally 'merged_by'
-        logins: Set[str] = set()
-        for pr in pr_rows:
-            user = pr.get("user")
-            # support both shapes: {'login': 'x'} or a plain string 'x'
-            if isinstance(user, dict):
-                login = user.get("login")
-                if login:
-                    logins.add(login)
-            elif isinstance(user, str):
-                logins.add(user)
-            # merged_by is less common in saved summaries, but handle both shapes too
-            merged_by = pr.get("merged_by")
-            if isinstance(merged_by, dict):
-                mlogin = merged_by.get("login")
-                if mlogin:
-                    logins.add(mlogin)
-            elif isinstance(merged_by, str):
-                logins.add(merged_by)
-
-        logins_list = sorted([l for l in logins if l])
-        if not logins_list:
-            if logger: logger.info(f"No user logins found for {entry}")
-            results[entry] = {"users_fetched": 0, "users": []}
-            continue
+            logins_list = sorted([l for l in logins if l])
+            if not logins_list:
+                if logger: logger.info(f"No user logins found for {entry}")
+                results[entry] = {"users_fetched": 0, "users": []}
+                continue
 
-        # fetch user details using existing helper
-        if logger: logger.info(f"Fetching {len(logins_list)} users for {entry}")
-        user_rows = users_details(logins_list, logger=logger)
+            # fetch details only for logins not already seen in another repo
+            missing = [l for l in logins_list if l not in user_cache]
+            if logger: logger.info(f"Fetching {len(missing)} users for {entry} ({len(logins_list) - len(missing)} cached)")
+            if missing:
+                for user in users_details(missing, session=session, logger=logger):
+                    user_cache[user.get("login")] = user
+            user_rows = [user_cache[l] for l in logins_list if l in user_cache]
 
-        # save JSON and CSV under the repo_dir
-        users_json_path = os.path.join(repo_dir, "users.json")
-        try:
-            save_json(user_rows, users_json_path)
-        except Exception:
-            # fallback to plain json dump
-            with open(users_json_path, "w", encoding="utf-8") as fh:
-                json.dump(user_rows, fh, ensure_ascii=False, indent=2)
-
-        df_users = to_dataframe_users(user_rows)
-        users_csv_path = os.path.join(repo_dir, "contributors.csv")
-        try:
-            df_users.to_csv(users_csv_path, index=False)
-        except Exception as e:
-            if logger: logger.warning(f"Failed to write CSV for {entry}: {e}")
+            # save JSON and CSV under the repo_dir
+            users_json_path = os.path.join(repo_dir, "users.json")
+            try:
+                save_json(user_rows, users_json_path)
+            except Exception:
+                # fallback to plain json dump
+                with open(users_json_path, "w", encoding="utf-8") as fh:
+                    json.dump(user_rows, fh, ensure_ascii=False)
 
-        results[entry] = {
-            "users_fetched": int(len(df_users)),
-            "users_json": users_json_path,
-            "users_csv": users_csv_path,
-            "logins_requested": logins_list
-        }
-        if logger: logger.info(f"Saved users for {entry}: {results[entry]['users_fetched']} rows")
-        time.sleep(0.1)
+            df_users = to_dataframe_users(user_rows)
+            users_csv_path = os.path.join(repo_dir, "contributors.csv")
+            try:
+                save_table(df_users, os.path.join(repo_dir, "contributors"), logger=logger)
+            except Exception as e:
+                if logger: logger.warning(f"Failed to write CSV for {entry}: {e}")
+
+            if master_writer is not None and len(df_users):
+                try:
+                    table = pa.Table.from_pandas(df_users, schema=_USERS_SCHEMA, preserve_index=False)
+                    for name, column in _repo_columns(os.path.normpath(repo_dir), entry, repos_by_name, table.num_rows).items():
+                        table = table.append_column(name, column)
+                    master_writer.write_table(table.replace_schema_metadata(None))
+                except (pa.ArrowException, ValueError) as e:
+                    # aggregate_contributors_master falls back to the per-repo tables
+                    if logger: logger.warning(f"Dropping {master_path}, could not append {entry}: {e}")
+                    master_writer.close()
+                    os.remove(master_tmp)
+                    master_writer = None
+
+            results[entry] = {
+                "users_fetched": int(len(df_users)),
+                "users_json": users_json_path,
+                "users_csv": users_csv_path,
+                "logins_requested": logins_list
+            }
+            if logger: logger.info(f"Saved users for {entry}: {results[entry]['users_fetched']} rows")
+        completed = True
+    finally:
+        # the writer is closed however the loop ends (e.g. users_details running out of retries);
+        # only a complete master replaces the previous one, a partial .tmp is removed
+        if master_writer is not None:
+            master_writer.close()
+            if completed:
+                os.replace(master_tmp, master_path)
+                if logger: logger.info(f"Wrote master Parquet: {master_path}")
+            else:
+                os.remove(master_tmp)
 
     # Try to produce a repos_by_topic.csv if repos_by_topic.json exists nearby
-    repos_by_topic_json = os.path.join(by_topics_dir, "repos_by_topic.json")
     csv_out = os.path.join(by_topics_dir, "repos_by_topic.csv")
-    if os.path.exists(repos_by_topic_json):
+    if repos_map:
         try:
-            with open(repos_by_topic_json, "r", encoding="utf-8") as fh:
-                repos_map = json.load(fh)
             rows = []
             for full, info in repos_map.items():
                 rows.append({
@@ -292,15 +577,17 @@ def scrape_users_from_prs(prs_parent_dir: str, by_topics_dir: str, logger: Optio
                     "html_url": info.get("html_url"),
                     "stargazers_count": info.get("stargazers_count"),
                     "forks_count": info.get("forks_count"),
-                    "topics": ",".join(info.get("topics", [])),
-                    "matched_topics": ",".join(info.get("matched_topics", []))
+                    "topics": info.get("topics", []),
+                    "matched_topics": info.get("matched_topics", [])
                 })
             df_repos = pd.DataFrame.from_records(rows)
-            df_repos.to_csv(csv_out, index=False)
+            save_table(df_repos, os.path.join(by_topics_dir, "repos_by_topic"), list_columns=("topics", "matched_topics"), logger=logger)
             if logger: logger.info(f"Wrote repos_by_topic CSV to {csv_out}")
         except Exception as e:
             if logger: logger.warning(f"Failed to write repos_by_topic.csv: {e}")
 
+    save_json(user_cache, os.path.join(by_topics_dir, USER_CACHE_FILENAME))
+
     # Save an index file of user outputs
     index_path = os.path.join(by_topics_dir, "pr_users_index.json")
     save_json(results, index_path)
@@ -309,14 +596,16 @@ def scrape_users_from_prs(prs_parent_dir: str, by_topics_dir: str, logger: Optio
 
 
 def aggregate_contributors_master(prs_parent_dir: str, by_topics_dir: str, out_csv: Optional[str]=None, logger: Optional[logging.Logger]=None) -> str:
-    """Aggregate per-repo contributor/user CSVs under `prs_parent_dir` into a single master CSV.
+    """Aggregate per-repo contributor/user tables under `prs_parent_dir` into a single master CSV.
 
-    - Looks for `contributors.csv` first, falls back to `users.csv` in each repo folder.
+    - Uses `{by_topics_dir}/all_contributors_master.parquet` as written by `scrape_users_from_prs`
+      when it is newer than every per-repo table; otherwise rebuilds it from the repo folders:
+    - Looks for `contributors` first, falls back to `users` in each repo folder, preferring the
+      `.parquet` copy over the `.csv` when both exist.
     - Augments rows with repo metadata from `{by_topics_dir}/repos_by_topic.json` when available.
-    - Writes `all_contributors_master.csv` under `by_topics_dir` (or `out_csv` if provided) and returns the path.
+    - Writes `all_contributors_master.csv` under `by_topics_dir` (or `out_csv` if provided) plus a
+      `.parquet` copy with list-valued `topics`/`matched_topics`, and returns the CSV path.
     """
-    import pandas as pd
-    import json
     from pathlib import Path
 
     prs_parent = Path(prs_parent_dir)
@@ -324,62 +613,60 @@ def aggregate_contributors_master(prs_parent_dir: str, by_topics_dir: str, out_c
     if out_csv:
         out_path = Path(out_csv)
     else:
-        out_path = by_topics / 'all_contributors_master.csv'
+        out_path = by_topics / f'{MASTER_BASENAME}.csv'
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    repo_tables = []
+    if prs_parent.exists():
+        for repo_dir in sorted([p for p in prs_parent.iterdir() if p.is_dir()]):
+            candidates = [repo_dir / f'{stem}.{ext}' for stem in ('contributors', 'users') for ext in ('parquet', 'csv')]
+            csv_path = next((p for p in candidates if p.exists()), None)
+            if csv_path is not None:
+                repo_tables.append((repo_dir, csv_path))
+
+    master_parquet = by_topics / f'{MASTER_BASENAME}.parquet'
+    if repo_tables and master_parquet.exists() and all(p.stat().st_mtime <= master_parquet.stat().st_mtime for _, p in repo_tables):
+        all_df = pq.read_table(master_parquet).to_pandas()
+        save_table(all_df, str(out_path.with_suffix('')), list_columns=('topics', 'matched_topics'),
+                   parquet=out_path.with_suffix('.parquet') != master_parquet, logger=logger)
+        if logger: logger.info(f"Wrote master CSV: {out_path} (rows={len(all_df)} from {master_parquet})")
+        return str(out_path)
 
     # Load repos map if present
     repos_map = {}
     repos_json = by_topics / 'repos_by_topic.json'
     if repos_json.exists():
         try:
-            with open(repos_json, 'r', encoding='utf-8') as fh:
-                repos_map = json.load(fh)
+            repos_map = load_json(repos_json)
         except Exception:
             repos_map = {}
+    repos_by_name = _index_repos_by_name(repos_map)
 
-    rows = []
-    repo_csv_count = 0
-    if prs_parent.exists():
-        for repo_dir in sorted([p for p in prs_parent.iterdir() if p.is_dir()]):
-            csv_path = repo_dir / 'contributors.csv'
-            if not csv_path.exists():
-                csv_path = repo_dir / 'users.csv'
-            if not csv_path.exists():
-                continue
-            try:
-                df = pd.read_csv(csv_path)
-            except Exception:
-                if logger: logger.warning(f"Failed to read CSV {csv_path}, skipping")
-                continue
-
-            repo_name = repo_dir.name
-            # find matching full_name in repos_map
-            full_match = None
-            for full, info in repos_map.items():
-                if info.get('name') == repo_name:
-                    full_match = (full, info)
-                    break
-
-            owner = full_match[1]['owner'] if full_match else None
-            full_name = full_match[0] if full_match else None
-            topics = ','.join(full_match[1].get('topics', [])) if full_match else ''
-            matched = ','.join(full_match[1].get('matched_topics', [])) if full_match else ''
-
-            df['repo_dir'] = str(repo_dir)
-            df['repo_name'] = repo_name
-            df['full_name'] = full_name
-            df['owner'] = owner
-            df['topics'] = topics
-            df['matched_topics'] = matched
+    tables = []
+    for repo_dir, csv_path in repo_tables:
+        try:
+            if csv_path.suffix == '.parquet':
+                table = pq.read_table(csv_path)
+            else:
+                # missing text reads as null, as pd.read_csv did, not as the literal "None"/"NA"
+                convert = pacsv.ConvertOptions(column_types={c: pa.string() for c in _TEXT_COLUMNS},
+                                               null_values=CSV_NULL_VALUES, strings_can_be_null=True)
+                table = pacsv.read_csv(csv_path, convert_options=convert)
+        except Exception:
+            if logger: logger.warning(f"Failed to read {csv_path}, skipping")
+            continue
 
-            rows.append(df)
-            repo_csv_count += 1
+        repo_columns = _repo_columns(str(repo_dir), repo_dir.name, repos_by_name, table.num_rows)
+        table = table.drop_columns([c for c in repo_columns if c in table.column_names])
+        for name, column in repo_columns.items():
+            table = table.append_column(name, column)
+        tables.append(table.replace_schema_metadata(None))
 
-    if not rows:
+    if not tables:
         raise RuntimeError(f"No contributor/user CSVs found under {prs_parent_dir}")
 
-    all_df = pd.concat(rows, ignore_index=True, sort=False)
-    # Ensure output dir exists
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    all_df.to_csv(out_path, index=False)
-    if logger: logger.info(f"Wrote master CSV: {out_path} (rows={len(all_df)} from {repo_csv_count} repo CSVs)")
+    # One concatenation over all repos; pandas is only used for the final write
+    all_df = pa.concat_tables(tables, promote_options="permissive").to_pandas()
+    save_table(all_df, str(out_path.with_suffix('')), list_columns=('topics', 'matched_topics'), logger=logger)
+    if logger: logger.info(f"Wrote master CSV: {out_path} (rows={len(all_df)} from {len(tables)} repo tables)")
     return str(out_path)
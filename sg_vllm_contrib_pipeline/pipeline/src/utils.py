@@ -1,13 +1,73 @@
 import os
 import json
+import re
 import time
+import random
 import logging
-from typing import Dict, Optional
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import requests
 from requests.models import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib json module is used otherwise
+    orjson = None
+try:
+    import ijson
+except ImportError:  # optional; JSON arrays are then loaded whole
+    ijson = None
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Cells pd.read_csv reads as missing by default; pyarrow's defaults lack "None" and "<NA>". Text
+# fields holding one of these are stored as null, so every table format reads back the same.
+CSV_NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                   "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+# Upper bound on concurrent GitHub requests (override with GITHUB_MAX_WORKERS). Worker
+# pools are sized from this and every request also holds a slot of the shared semaphore
+# while it is in flight, so nested pools cannot exceed it.
+MAX_WORKERS = int(os.environ.get("GITHUB_MAX_WORKERS", "8"))
+_inflight = threading.BoundedSemaphore(MAX_WORKERS)
+
+# Persistent conditional-GET cache, off unless GITHUB_HTTP_CACHE names its SQLite file
+# (e.g. ~/.cache/sg_vllm_pipeline/http_cache.sqlite)
+HTTP_CACHE_PATH = os.path.expanduser(os.environ.get("GITHUB_HTTP_CACHE", ""))
+# Entries older than this many seconds are dropped rather than revalidated
+HTTP_CACHE_EXPIRE_AFTER = int(os.environ.get("GITHUB_HTTP_CACHE_EXPIRE", str(7 * 24 * 3600)))
+# Once the stored bodies exceed this many bytes the oldest entries are evicted
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("GITHUB_HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024
+# Only these endpoints are cached: they are stable between runs, so revalidation mostly ends in a
+# 304. Listings such as /pulls shift whenever something new is opened and are never stored.
+_CACHEABLE_PATH_RE = re.compile(r"^/(?:users/[^/]+|repos/[^/]+/[^/]+/(?:stats/[^/]+|topics|contributors))/?$")
+# Response headers replayed from the cache alongside the body
+_CACHED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+# Once less than this fraction of a rate-limit window is left, spread the remaining
+# requests evenly until the window resets instead of running into 403/429s.
+PACE_BELOW_FRACTION = 0.1
 
 def make_session() -> requests.Session:
-    s = requests.Session()
+    s = RateLimitedSession()
+    # One keep-alive pool per host, large enough for every worker thread; transient gateway
+    # errors on GETs are retried at the connection level. Plain http:// (redirects, GitHub
+    # Enterprise hosts) shares the same adapter instead of requests' default 10-connection one.
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(["GET"]), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(64, MAX_WORKERS), pool_block=False, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     token = os.environ.get("GITHUB_TOKEN")
     headers = {
         "Accept": "application/vnd.github+json",
@@ -18,20 +78,312 @@ def make_session() -> requests.Session:
     s.headers.update(headers)
     return s
 
-def save_json(obj, path: str):
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Session shared by every GitHub call in the process, so connections (and TLS) are reused."""
+    return make_session()
+
+def last_page(r: Response) -> Optional[int]:
+    """Return the page number from the `rel="last"` Link header, or None for single-page results."""
+    url = r.links.get("last", {}).get("url")
+    if not url:
+        return None
+    try:
+        return int(parse_qs(urlparse(url).query)["page"][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+class HttpCache:
+    """SQLite store of GET response bodies keyed by URL, revalidated with ETag / Last-Modified.
+
+    GitHub answers a matching `If-None-Match` / `If-Modified-Since` with 304, which does not
+    count against the rate limit, so unchanged resources cost next to nothing on re-runs.
+    Entries expire after `expire_after` seconds and the oldest are evicted once the bodies
+    exceed `max_bytes`; only URLs accepted by `cacheable` are stored.
+    """
+
+    def __init__(self, path: str, expire_after: int=HTTP_CACHE_EXPIRE_AFTER, max_bytes: int=HTTP_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.expire_after = expire_after
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._added = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+        if columns and "stored_at" not in columns:
+            # unbounded layout from before expiry/eviction existed
+            self._conn.execute("DROP TABLE responses")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, body BLOB, stored_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def cacheable(url: str) -> bool:
+        return bool(_CACHEABLE_PATH_RE.match(urlparse(url).path))
+
+    @staticmethod
+    def key(session: requests.Session, url: str, params: Optional[Dict]=None, headers: Optional[Dict]=None) -> str:
+        accept = (headers or {}).get("Accept") or session.headers.get("Accept", "")
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        return f"{full_url}|{accept}"
+
+    def get(self, key: str) -> Optional[Tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ? AND stored_at >= ?",
+                (key, time.time() - self.expire_after),
+            ).fetchone()
+
+    def put(self, key: str, r: Response):
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        headers = {h: r.headers[h] for h in _CACHED_HEADERS if h in r.headers}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), r.content, time.time()),
+            )
+            self._added += len(r.content)
+            # the size check scans every row, so it only runs after a tenth of the budget was added
+            if self._added > self.max_bytes // 10:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then the oldest ones until the bodies fit in max_bytes (lock held)."""
+        self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.expire_after,))
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM (SELECT key, SUM(length(body)) "
+            "OVER (ORDER BY stored_at DESC) AS kept FROM responses) WHERE kept > ?)",
+            (self.max_bytes,),
+        )
+        self._conn.commit()
+        self._added = 0
+
+    @staticmethod
+    def conditional_headers(entry: Tuple) -> Dict[str, str]:
+        etag, last_modified = entry[0], entry[1]
+        out = {}
+        if etag:
+            out["If-None-Match"] = etag
+        if last_modified:
+            out["If-Modified-Since"] = last_modified
+        return out
+
+    @staticmethod
+    def replay(entry: Tuple, not_modified: Response) -> Response:
+        """Build a 200 Response from a cache entry, keeping the live 304's rate-limit headers."""
+        r = Response()
+        r.status_code = 200
+        r.reason = "OK"
+        r.url = not_modified.url
+        r.request = not_modified.request
+        r.headers = CaseInsensitiveDict(not_modified.headers)
+        r.headers.update(json.loads(entry[2]))
+        r.encoding = "utf-8"
+        r._content = entry[3]
+        return r
+
+
+_http_cache: Optional[HttpCache] = None
+_http_cache_lock = threading.Lock()
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Return the process-wide HttpCache, or None when disabled or unavailable."""
+    global _http_cache, HTTP_CACHE_PATH
+    with _http_cache_lock:
+        if _http_cache is None and HTTP_CACHE_PATH:
+            try:
+                _http_cache = HttpCache(HTTP_CACHE_PATH)
+            except (OSError, sqlite3.Error):
+                HTTP_CACHE_PATH = ""
+        return _http_cache
+
+def _rate_limit_resource(url: str) -> str:
+    """Name of the GitHub rate-limit bucket a URL is charged against."""
+    if "/search/" in url:
+        return "search"
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+def rate_limit_wait(r: Response) -> float:
+    """Seconds to hold off before the next request to the same rate-limit bucket.
+
+    Zero while the budget is healthy; below PACE_BELOW_FRACTION of the limit the remaining
+    requests are spread evenly over the time left until X-RateLimit-Reset.
+    """
+    try:
+        remaining = int(r.headers["X-RateLimit-Remaining"])
+        limit = int(r.headers["X-RateLimit-Limit"])
+        reset = int(r.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return 0.0
+    if remaining >= limit * PACE_BELOW_FRACTION:
+        return 0.0
+    return max(0.0, (reset - time.time()) / max(remaining, 1))
+
+def _is_rate_limited(r: Response) -> bool:
+    """True for 429s and for the 403s GitHub sends when a primary or secondary limit is hit."""
+    if r.status_code == 429:
+        return True
+    return r.status_code == 403 and ("Retry-After" in r.headers or r.headers.get("X-RateLimit-Remaining") == "0")
+
+class RateLimitedSession(requests.Session):
+    """Session that paces its own requests with an adaptive token bucket.
+
+    Requests draw from a bucket of up to `burst` tokens refilled at `rate` per second. Every
+    successful response raises the rate by `increase` (up to `max_rate`); a rate-limited one halves
+    it (down to `min_rate`) and empties the bucket, so the send rate settles just below what GitHub
+    accepts. On top of that, each rate-limit resource (core/search/graphql) is held back as long as
+    its last response's headers ask for (see rate_limit_wait). Safe to share between threads.
+    """
+
+    def __init__(self, rate: float=5.0, max_rate: float=15.0, min_rate: float=0.5, increase: float=0.1, burst: float=MAX_WORKERS):
+        super().__init__()
+        self.max_rate, self.min_rate, self.increase, self.burst = max_rate, min_rate, increase, burst
+        self._rate = rate
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._not_before: Dict[str, float] = {}
+        self._bucket_lock = threading.Lock()
+
+    def _acquire(self, resource: str):
+        while True:
+            with self._bucket_lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+                self._last_refill = now
+                wait = self._not_before.get(resource, 0.0) - time.time()
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def _feedback(self, resource: str, r: Response):
+        with self._bucket_lock:
+            if _is_rate_limited(r):
+                self._rate = max(self.min_rate, self._rate * 0.5)
+                self._tokens = 0.0
+            elif r.status_code < 400:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+            self._not_before[resource] = time.time() + rate_limit_wait(r)
+
+    def request(self, method, url, *args, **kwargs) -> Response:
+        resource = _rate_limit_resource(url)
+        self._acquire(resource)
+        r = super().request(method, url, *args, **kwargs)
+        self._feedback(resource, r)
+        return r
+
+def save_json(obj, path: str, pretty: bool=False):
+    """Write `obj` as compact JSON; `pretty=True` indents it (for small files people read, like the manifest)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=option))
+        return
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+        json.dump(obj, f, ensure_ascii=False, indent=2 if pretty else None)
+
+def save_table(df: pd.DataFrame, base: str, list_columns: Sequence[str]=(), parquet: bool=True, logger: Optional[logging.Logger]=None) -> Tuple[str, Optional[str]]:
+    """Write `df` to `<base>.csv` and `<base>.parquet` (zstd) and return both paths.
+
+    Columns in `list_columns` hold lists of strings: Parquet stores them as list<string> while the
+    CSV keeps the comma-joined form existing readers expect. A DataFrame Parquet cannot encode
+    (e.g. mixed-type object columns) only gets the CSV and None is returned for the Parquet path,
+    as it is when `parquet=False` (the caller already has the Parquet copy).
+    """
+    csv_path, parquet_path = f"{base}.csv", f"{base}.parquet"
+    joined = {c: df[c].map(lambda v: ",".join(v) if isinstance(v, (list, tuple, np.ndarray)) else v) for c in list_columns if c in df.columns}
+    df.assign(**joined).to_csv(csv_path, index=False)
+    if not parquet:
+        return csv_path, None
+    try:
+        df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+    except (pa.ArrowException, ValueError) as e:
+        if logger: logger.warning(f"Skipping Parquet output {parquet_path}: {e}")
+        parquet_path = None
+    return csv_path, parquet_path
+
+def jsonl_line(obj) -> bytes:
+    """Encode one record as a JSON Lines row (compact, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+def iter_jsonl(path: str) -> Iterator:
+    """Yield records from a JSON Lines file one at a time."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+def iter_json_array(path: str) -> Iterator:
+    """Yield the elements of a JSON array file, streamed with ijson when it is installed."""
+    if ijson is None:
+        yield from load_json(path)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+def response_json(r: Response):
+    """Decode a response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(r.content)
+    return r.json()
+
+def load_json(path: str):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def backoff_delay(attempt: int, backoff: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(max_delay, backoff * 2**attempt)].
 
-def get_json_with_retry(session: requests.Session, url: str, params: Optional[Dict]=None, max_retries: int=6, backoff: float=2.0, logger: Optional[logging.Logger]=None):
-    """GET a JSON endpoint with simple retry (useful for /stats endpoints which may return 202)."""
+    The randomness keeps concurrent workers (and concurrent runs) from retrying in lockstep.
+    """
+    return random.uniform(0, min(max_delay, backoff * 2 ** attempt))
+
+def get_json_with_retry(session: requests.Session, url: str, params: Optional[Dict]=None, max_retries: int=6, backoff: float=2.0, max_delay: float=30.0, logger: Optional[logging.Logger]=None):
+    """GET a JSON endpoint with simple retry (useful for /stats endpoints which may return 202).
+
+    Like request_with_rate_limit, a cacheable endpoint is revalidated against the HttpCache when it is
+    enabled: a 304 returns the cached body. Only complete 200 responses are stored, never a 202 placeholder.
+    """
+    cache = get_http_cache() if HttpCache.cacheable(url) else None
+    cache_key, cached, headers = None, None, None
+    if cache is not None:
+        cache_key = HttpCache.key(session, url, params=params)
+        cached = cache.get(cache_key)
+        if cached:
+            headers = HttpCache.conditional_headers(cached)
     for attempt in range(max_retries):
-        r = session.get(url, params=params, timeout=60)
+        with _inflight:
+            r = session.get(url, params=params, headers=headers, timeout=60)
+        if r.status_code == 304 and cached:
+            return response_json(HttpCache.replay(cached, r))
         if r.status_code == 200:
+            if cache is not None:
+                cache.put(cache_key, r)
             return r.json()
         elif r.status_code == 202:
             # Stats being generated — wait and retry
             if logger: logger.info("202 Accepted (processing). Sleeping before retry...")
-            time.sleep(backoff * (attempt + 1))
+            time.sleep(backoff_delay(attempt + 1, backoff, max_delay))
         else:
             msg = f"GitHub request failed: {r.status_code} {r.text[:200]}"
             if logger: logger.warning(msg)
@@ -39,37 +391,56 @@ def get_json_with_retry(session: requests.Session, url: str, params: Optional[Di
     raise RuntimeError(f"Max retries reached for {url}")
 
 
-def request_with_rate_limit(session: requests.Session, method: str, url: str, params: Optional[Dict]=None, headers: Optional[Dict]=None, timeout: int=60, max_retries: int=6, backoff: float=1.5, logger: Optional[logging.Logger]=None) -> Response:
+def request_with_rate_limit(session: requests.Session, method: str, url: str, params: Optional[Dict]=None, headers: Optional[Dict]=None, timeout: int=60, max_retries: int=6, backoff: float=1.5, max_delay: float=30.0, logger: Optional[logging.Logger]=None, json_body: Optional[Dict]=None) -> Response:
     """Make an HTTP request using the provided session and respect GitHub rate-limit headers.
 
     Behavior:
     - On 200/201/204 return the Response.
     - On 202 (processing) wait and retry (like get_json_with_retry).
-    - On 429 or 403 inspect Retry-After or X-RateLimit-Reset and sleep until reset before retrying.
+    - On 429 or 403 inspect Retry-After or X-RateLimit-Reset and sleep until reset (plus up to a second
+      of jitter) before retrying, falling back to exponential backoff when neither header is present.
+    - Outbound pacing is left to the session (see RateLimitedSession, which make_session returns).
     - For 404 return the Response so callers can handle missing resources.
     - For other 4xx/5xx, retry with exponential backoff up to max_retries then raise for status.
+      Backoff sleeps use full jitter capped at max_delay seconds (see backoff_delay).
+    - With the HttpCache enabled, GETs of cacheable endpoints (see HttpCache.cacheable) are
+      revalidated against it; a 304 is returned as the cached 200.
     """
+    cache = get_http_cache() if method.upper() == "GET" and HttpCache.cacheable(url) else None
+    cache_key, cached = None, None
+    if cache is not None:
+        cache_key = HttpCache.key(session, url, params=params, headers=headers)
+        cached = cache.get(cache_key)
+        if cached:
+            headers = {**(headers or {}), **HttpCache.conditional_headers(cached)}
     attempt = 0
     while attempt < max_retries:
         attempt += 1
         try:
-            r = session.request(method, url, params=params, headers=headers, timeout=timeout)
+            with _inflight:
+                r = session.request(method, url, params=params, headers=headers, timeout=timeout, json=json_body)
         except Exception as e:
             if logger:
                 logger.warning(f"Request exception {e} for {url}, attempt {attempt}")
             # backoff then retry
-            time.sleep(backoff * attempt)
+            time.sleep(backoff_delay(attempt, backoff, max_delay))
             continue
 
         status = r.status_code
         # Success
         if status in (200, 201, 204):
+            if cache is not None and status == 200:
+                cache.put(cache_key, r)
             return r
 
+        # Unchanged since the cached copy
+        if status == 304 and cached:
+            return HttpCache.replay(cached, r)
+
         # Processing (e.g., contributor stats)
         if status == 202:
             if logger: logger.info(f"202 Accepted for {url} — processing, retrying after backoff")
-            time.sleep(backoff * attempt)
+            time.sleep(backoff_delay(attempt, backoff, max_delay))
             continue
 
         # Rate limiting or forbidden: try to honor Retry-After or X-RateLimit-Reset
@@ -92,13 +463,14 @@ def request_with_rate_limit(session: requests.Session, method: str, url: str, pa
                     wait = max(0, reset_ts - now) + 2
                 except Exception:
                     wait = None
-            # fallback exponential backoff
+            # fallback exponential backoff; otherwise spread the wake-ups of workers waiting on the same reset
             if wait is None:
-                wait = min(60, int(backoff * attempt))
-            if wait > 0:
-                if logger: logger.info(f"Sleeping {wait}s due to rate-limit for {url}")
-                time.sleep(wait)
-                continue
+                wait = backoff_delay(attempt, backoff, max_delay)
+            else:
+                wait += random.uniform(0, 1)
+            if logger: logger.info(f"Sleeping {wait:.1f}s due to rate-limit for {url}")
+            time.sleep(wait)
+            continue
 
         # Not found: return so caller can skip gracefully
         if status == 404:
@@ -108,7 +480,7 @@ def request_with_rate_limit(session: requests.Session, method: str, url: str, pa
         # Other client/server errors: backoff and retry
         if 400 <= status < 600:
             if logger: logger.warning(f"Request failed {status} for {url}, attempt {attempt}")
-            time.sleep(backoff * attempt)
+            time.sleep(backoff_delay(attempt, backoff, max_delay))
             continue
 
         # Unknown: return response
@@ -119,3 +491,43 @@ def request_with_rate_limit(session: requests.Session, method: str, url: str, pa
         r.raise_for_status()
     except Exception:
         raise RuntimeError(f"Max retries reached for {url}")
+
+
+def fetch_many(session: requests.Session, urls: Iterable[str], workers: int=MAX_WORKERS, logger: Optional[logging.Logger]=None, **kwargs) -> Iterator[Tuple[str, Response]]:
+    """GET every URL through `request_with_rate_limit` on a thread pool sharing `session`.
+
+    Yields `(url, response)` pairs as they complete (not in input order); extra keyword
+    arguments (`headers`, `timeout`, ...) are passed on to `request_with_rate_limit`.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(request_with_rate_limit, session, 'GET', url, logger=logger, **kwargs): url for url in urls}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+def graphql_batch(session: requests.Session, logins: Sequence[str], fields: str, batch_size: int=100, logger: Optional[logging.Logger]=None) -> Dict[str, Dict]:
+    """Look up many users with one aliased GraphQL query per `batch_size` logins.
+
+    Each query is `u0: user(login: "...") { <fields> } u1: ...`; batches are posted concurrently and
+    the combined answers are split back out by alias. Returns {login: user node} for the logins
+    GitHub resolved (organizations, bots and unknown logins come back null and are left out).
+    """
+    def fetch_batch(batch: Sequence[str]) -> Dict[str, Dict]:
+        nodes = " ".join(f"u{i}: user(login: {json.dumps(login)}) {{ {fields} }}" for i, login in enumerate(batch))
+        query = f"query {{ rateLimit {{ cost remaining resetAt }} {nodes} }}"
+        r = request_with_rate_limit(session, 'POST', GITHUB_GRAPHQL_URL, json_body={"query": query}, timeout=60, logger=logger)
+        if r.status_code != 200:
+            if logger: logger.warning(f"GraphQL user batch failed: {r.status_code} {getattr(r, 'text', '')[:200]}")
+            return {}
+        data = response_json(r).get("data") or {}
+        limit = data.get("rateLimit") or {}
+        if logger and limit: logger.info(f"GraphQL batch of {len(batch)} users cost {limit.get('cost')}, {limit.get('remaining')} points left until {limit.get('resetAt')}")
+        return {login: data[f"u{i}"] for i, login in enumerate(batch) if data.get(f"u{i}")}
+
+    batches = [logins[i:i + batch_size] for i in range(0, len(logins), batch_size)]
+    found: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        for nodes in ex.map(fetch_batch, batches):
+            found.update(nodes)
+    if logger: logger.info(f"Resolved {len(found)}/{len(logins)} users via GraphQL in {len(batches)} requests")
+    return found